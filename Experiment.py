@@ -15,13 +15,13 @@ function for a Cesium-Antimony photodiode.
 ## Imports
 ######################################################################
 
-import re, unicodedata
+import re, math, unicodedata
 import os, sys
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
-from termcolor import cprint
+from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
+from termcolor import colored
 import LightSource as source
 
 ######################################################################
@@ -38,6 +38,25 @@ __maintainer__ = "Conner Graham"
 __email__ = "connergraham888@gmail.com"
 __status__ = "Development"
 
+######################################################################
+# Module Constants
+######################################################################
+
+_SLUG_STRIP = re.compile(r'[^\w\s-]')         # characters that are not allowed in a slug
+_SLUG_DASH = re.compile(r'[-\s]+')            # runs of whitespace and dashes in a slug
+_FLOAT_RE = re.compile(r'^\s*\+?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?\s*$')     # unsigned real number
+
+# Error messages displayed to the user (colored once at import)
+_ERR_YES_NO = colored("ERROR: invalid input: please enter either 'y' or 'n'", 'red') + '\n'
+_ERR_SOURCE_TYPE = colored("ERROR: invalid input: please enter either 'LED' or 'Laser'", 'red') + '\n'
+_ERR_WAVELENGTH = colored('ERROR: invalid input: wavelength must be a positive real number', 'red') + '\n'
+_ERR_READ_CSV = colored('ERROR: read_csv: unable to load file', 'red') + '\n'
+_ERR_REMOVE = colored('ERROR: invalid entry: no entries were removed', 'red') + '\n'
+_ERR_UPDATE = colored('ERROR: invalid entry: no entries were updated', 'red') + '\n'
+_ERR_VIEW = colored('ERROR: invalid entry: unable to view entry', 'red') + '\n'
+_ERR_SAVE_LOG = colored('ERROR: save_log: unable to save data to files', 'red') + '\n'
+_ERR_SAVE_RESULTS = colored('ERROR: save_results: unable to save results to file', 'red') + '\n'
+
 ######################################################################
 # Experiment Class Definition
 ######################################################################
@@ -50,6 +69,14 @@ class Experiment(object):
     __SPEED_LIGHT = 299792458                   # the accepted value for the speed of light
     __N_AIR = 1.000293                          # the accepted value for the refractive index of air (at room temp)
     __ELECTRON_CHARGE = -1.602176634e-19        # the accepted value for the charge of an electron
+    __ABS_E = abs(__ELECTRON_CHARGE)            # the magnitude of the charge of an electron
+
+    # Plot colors for the purple, blue, green, yellow, orange, and red bands of the visible spectrum
+    __COLOR_TABLE = ('darkviolet', 'blue', 'forestgreen', 'gold', 'darkorange', 'red')
+
+    # Valid (lowercase) responses for user prompts
+    __YES_NO = frozenset(('y', 'n'))
+    __SOURCE_TYPES = frozenset(('led', 'laser'))
 
     def __init__(self, name="unnamed"):
         """Constructor for the Experiment class.
@@ -62,9 +89,19 @@ class Experiment(object):
         slug_name = self.__slugify(name)        # get properly formatted name
         self.__name = 'unnamed' if (slug_name == '') else slug_name
         self.__datalog = []
-        self.__energy_df = None
+        self.__wavelengths_nm = np.empty(8)     # wavelength of each datalog entry (parallel to datalog)
+        self.__voltages = np.empty(8)           # stopping voltage of each datalog entry (parallel to datalog)
+        self.__lam = None                       # source wavelengths (in meters), sorted
+        self.__nu = None                        # source frequencies (in hertz)
+        self.__Vs = None                        # source stopping voltages (in volts)
+        self.__E = None                         # source max energies (in joules)
+        self.__energy_fit = None                # regression (slope, intercept) of energy vs frequency
+        self.__fit_line = None                  # regression line (frequencies, energies) endpoints
         self.__plank = 0
         self.__work_func = 0
+        self.__results_dirty = True             # whether the datalog changed since results were computed
+        self.__fig = None                       # off-screen figure reused for saving results plots
+        self.__ax = None
         return
 
     def __slugify(self, value, allow_unicode=False):
@@ -87,12 +124,15 @@ class Experiment(object):
             The properly formatted filename for the object.
         """
         value = str(value)
+        # Skip normalization for names that are already simple ASCII slugs
+        if (value.isascii() and '--' not in value and all((c.isalnum() or c in '-_') for c in value)):
+            return value.lower().strip('-_')
         if allow_unicode:
             value = unicodedata.normalize('NFKC', value)
         else:
             value = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore').decode('ascii')
-        value = re.sub(r'[^\w\s-]', '', value.lower())
-        return re.sub(r'[-\s]+', '-', value).strip('-_')
+        value = _SLUG_STRIP.sub('', value.lower())
+        return _SLUG_DASH.sub('-', value).strip('-_')
     
     def get_name(self):
         """Gets the name given to the experiment.
@@ -112,8 +152,7 @@ class Experiment(object):
         option_range : tuple(int)
             The lower and upper bounds of the tange of valid options for the experiment.
         """
-        option_keys = self.__options.keys()
-        return (min(option_keys), max(option_keys))
+        return (0, len(self.__options) - 1)
 
     def __get_plank_error(self):
         """Calculates the percent error in the estimate of Plank's constant for the experiment.
@@ -125,53 +164,85 @@ class Experiment(object):
         """
         return (abs((self.__plank - self.__PLANKS_CONSTANT) / self.__PLANKS_CONSTANT) * 100)
     
-    def __create_energy_df(self):
-        """Loads the collected wavelength vs source max energy data into a dataframe for the experiment."""
+    def __create_energy_data(self):
+        """Loads the collected wavelength vs source max energy data into arrays for the experiment."""
         # Retrieve the wavelength vs stopping voltage for each light source
-        source_data = np.array([[entry.get_wavelength(), entry.get_stopping_voltage()] for entry in self.__datalog])
-        # Create empty dataframe with columns for source wavelength, frequency, stopping voltage, and max energy.
-        energy_df = pd.DataFrame([], columns=['λ', 'ν', 'V_s', 'E'])
-        # Load collected data into dataframe
-        energy_df['λ'] = (source_data[:,0] * 1e-09)
-        energy_df['ν'] = self.__SPEED_LIGHT / (self.__N_AIR * energy_df['λ'])
-        energy_df['V_s'] = source_data[:,1]
-        energy_df['E'] = abs(self.__ELECTRON_CHARGE) * energy_df['V_s']
-        # Sort dataframe by ordering based on increasing wavelength
-        self.__energy_df = energy_df.sort_values(by=['λ'])
+        log_size = len(self.__datalog)
+        wavelength = self.__wavelengths_nm[:log_size] * 1e-09
+        stop_voltage = self.__voltages[:log_size]
+        # Order data based on increasing wavelength
+        order = np.argsort(wavelength, kind='stable')
+        # Load source wavelength, frequency, stopping voltage, and max energy into arrays
+        self.__lam = wavelength[order]
+        self.__nu = self.__SPEED_LIGHT / (self.__N_AIR * self.__lam)
+        self.__Vs = stop_voltage[order]
+        self.__E = self.__ABS_E * self.__Vs
         return
 
-    def __get_color(self, wavelength_nm):
-        """Gets the plot color for the light source..
+    def __get_colors(self, wavelength_nm):
+        """Gets the plot colors for the light sources.
 
         Parameters
         ----------
-        wavelength_nm : float
-            The wavelength (in nanometers) of a light source.
+        wavelength_nm : ndarray
+            The wavelengths (in nanometers) of the light sources.
 
         Returns
         -------
-        color : string
-            The color (used for plotting) of the light source.
+        colors : ndarray
+            The colors (used for plotting) of the light sources.
+        """
+        # Determine which color range each wavelength falls in
+        color_ranges = [(wavelength_nm >= 400) & (wavelength_nm < 450),         # color = purple
+                        (wavelength_nm >= 450) & (wavelength_nm < 500),         # color = blue
+                        (wavelength_nm >= 500) & (wavelength_nm < 570),         # color = green
+                        (wavelength_nm >= 570) & (wavelength_nm < 590),         # color = yellow
+                        (wavelength_nm >= 590) & (wavelength_nm < 610),         # color = orange
+                        (wavelength_nm >= 610) & (wavelength_nm <= 700)]        # color = red
+        # Wavelengths outside the visible spectrum are plotted in black
+        return np.select(color_ranges, self.__COLOR_TABLE, default='black')
+
+    def __fit_energy_data(self):
+        """Perform a linear regression of the collected light source energy data for the experiment to
+        estimate the values of Plank's constant and the photodiode work function.
         """
-        # Determine which color range the wavelength falls in
-        if (wavelength_nm >= 400 and wavelength_nm < 450):          # color = purple
-            return 'darkviolet'
-        elif (wavelength_nm >= 450 and wavelength_nm < 500):        # color = blue
-            return 'blue'
-        elif (wavelength_nm >= 500 and wavelength_nm < 570):        # color = green
-            return 'forestgreen'
-        elif (wavelength_nm >= 570 and wavelength_nm < 590):        # color = yellow
-            return 'gold'
-        elif (wavelength_nm >= 590 and wavelength_nm < 610):        # color = orange
-            return 'darkorange'
-        elif (wavelength_nm >= 610 and wavelength_nm <= 700):       # color = red
-            return 'red'
-        else:                                                       # color outside visible spectrum
-            return 'black'
+        # Perform least squares linear regression of energy data for which to estimate Plank's constant
+        # and work function
+        frequency, energy = self.__nu, self.__E
+        N = frequency.size
+        sum_f, sum_e = frequency.sum(), energy.sum()
+        sum_fe, sum_ff = frequency.dot(energy), frequency.dot(frequency)
+        denominator = N*sum_ff - sum_f*sum_f
+        # With fewer than two distinct frequencies the slope is undetermined, so fall back to a horizontal
+        # line through the mean energy (the same fit scikit-learn's LinearRegression gives)
+        if (frequency.max() > frequency.min() and denominator > 0):
+            slope = float((N*sum_fe - sum_f*sum_e) / denominator)
+        else:
+            slope = 0.0
+        intercept = float((sum_e - slope*sum_f) / N)
+        self.__energy_fit = (slope, intercept)
+        # Evaluate regression line at the frequency endpoints
+        freq_range = np.array([frequency.min(), frequency.max()])
+        self.__fit_line = (freq_range, slope*freq_range + intercept)
+        # Estimate Plank's constant and work function
+        self.__work_func = intercept / self.__ELECTRON_CHARGE
+        self.__plank = slope
+        return
+
+    def __update_results(self):
+        """Recomputes the energy data and regression estimates for the experiment if the datalog has
+        changed since they were last computed.
+        """
+        if (self.__results_dirty):
+            # Create wavelength vs energy data from each light source entry in datalog
+            self.__create_energy_data()
+            # Estimate Plank's constant and work function from the energy data
+            self.__fit_energy_data()
+            self.__results_dirty = False
+        return
 
     def __plot_energy_data(self, margin=1e-20, save=False):
-        """Graph the collected light source energy data for the experiment and perform a linear regression
-        to estimate the values of Plank's constant and the photodiode work function.
+        """Graph the collected light source energy data and fitted regression line for the experiment.
 
         Parameters
         ----------
@@ -180,37 +251,42 @@ class Experiment(object):
         save : bool, optional
             Whether or not to save the plot to a file.
         """
-        # Extract frequency and energy data and plot color from dataframe
-        frequency = np.array(self.__energy_df['ν'], dtype='float').reshape(-1,1)
-        energy = np.array(self.__energy_df['E'], dtype='float').reshape(-1,1)
-        source_colors = [self.__get_color(λ/1e-09) for λ in self.__energy_df['λ']]
-        # Perform linear regression of energy data for which to estimate Plank's constant and work function
-        energy_model = LinearRegression()
-        energy_model.fit(frequency, energy)
-        weights = np.array([energy_model.intercept_, energy_model.coef_], dtype=object).flatten()
-        Y_pred = weights[1]*frequency + weights[0]
-        # Estimate Plank's constant and work function
-        self.__work_func = weights[0] / self.__ELECTRON_CHARGE
-        self.__plank = weights[1]
+        # Extract frequency and energy data and plot color
+        frequency = self.__nu
+        energy = self.__E
+        source_colors = self.__get_colors(self.__lam / 1e-09)
+        # Extract regression line endpoints
+        slope, intercept = self.__energy_fit
+        freq_range, Y_pred = self.__fit_line
+        # Get figure to plot to, reusing the off-screen figure if the plot is being saved
+        if (save):
+            if (self.__fig is None):
+                self.__fig = Figure()
+                self.__ax = self.__fig.add_subplot()
+            fig, ax = self.__fig, self.__ax
+            ax.cla()
+        else:
+            fig, ax = plt.subplots()
         # Plot frequency vs energy data
-        if (save): fig = plt.figure()
-        plt.scatter(frequency, energy, color=source_colors)
+        ax.scatter(frequency, energy, color=source_colors, rasterized=True)
         # Plot regression line
-        label = 'KE = ({0:.4e})f {1:+.4e}'.format(weights[1], weights[0])
-        plt.plot([min(frequency), max(frequency)], [min(Y_pred), max(Y_pred)], label=label, linestyle='dashed', color='darkgray')
+        label = 'KE = ({0:.4e})f {1:+.4e}'.format(slope, intercept)
+        regression_line = LineCollection([np.column_stack((freq_range, Y_pred))], label=label,
+                                         linestyles='dashed', colors='darkgray')
+        ax.add_collection(regression_line)
+        ax.autoscale_view()
         # # Add labels and other details to graph
-        plt.title("Determining Plank's Constant", fontsize=18)
-        plt.xlabel('Frequency (Hz)', fontsize=14)
-        plt.ylabel('Required Work (J)', fontsize=14)
-        plt_range = (min(min(energy), min(Y_pred)),max(max(energy), max(Y_pred)))
-        plt.ylim(plt_range[0]-margin, plt_range[1]+margin)
-        plt.grid()
-        plt.legend(loc='upper left')
+        ax.set_title("Determining Plank's Constant", fontsize=18)
+        ax.set_xlabel('Frequency (Hz)', fontsize=14)
+        ax.set_ylabel('Required Work (J)', fontsize=14)
+        plt_range = (min(energy.min(), Y_pred.min()), max(energy.max(), Y_pred.max()))
+        ax.set_ylim(plt_range[0]-margin, plt_range[1]+margin)
+        ax.grid(True)
+        ax.legend(loc='upper left')
         # Save or show the plot
         if (save):
             path = './' + self.__name + '/' + 'plank_estimate.jpg'
             fig.savefig(path, bbox_inches='tight', dpi=250)
-            plt.close('all')
         else:
             plt.show()
         return
@@ -231,22 +307,23 @@ class Experiment(object):
             if (save):
                 # Get or create directory to save report to
                 out_dir = './' + self.__name
-                if (not os.path.exists(out_dir)):
-                    os.mkdir(out_dir)
+                os.makedirs(out_dir, exist_ok=True)
                 # Create file to save report to
                 path = out_dir + '/' + 'report.txt'
                 sys.stdout = open(path, 'w', encoding='utf-8')
             # Print or save experiment datalog
             self.__display_log()
             # Print or save experiment estimates and results
-            print('\n-------------------- Report --------------------')
-            print('Cesium-Antimony Work Function (Φ):')
-            print('  actual   = {0}-{1} eV'.format(self.__WF_CESIUM_ANTIMONY[0], self.__WF_CESIUM_ANTIMONY[1]))
-            print('  estimate = {:.5f} eV'.format(self.__work_func))
-            print("Plank's Constant (h):")
-            print('  actual   = {:.8e} J⋅s'.format(self.__PLANKS_CONSTANT))
-            print('  estimate = {:.8e} J⋅s'.format(self.__plank))
-            print('  % error  = {:.4f}%'.format(self.__get_plank_error()))
+            wf_low, wf_high = self.__WF_CESIUM_ANTIMONY
+            lines = ['\n-------------------- Report --------------------',
+                     'Cesium-Antimony Work Function (Φ):',
+                     f'  actual   = {wf_low}-{wf_high} eV',
+                     f'  estimate = {self.__work_func:.5f} eV',
+                     "Plank's Constant (h):",
+                     f'  actual   = {self.__PLANKS_CONSTANT:.8e} J⋅s',
+                     f'  estimate = {self.__plank:.8e} J⋅s',
+                     f'  % error  = {self.__get_plank_error():.4f}%']
+            sys.stdout.write('\n'.join(lines) + '\n')
             # Close file and restore standard output stream
             if (save):
                 sys.stdout.close()
@@ -261,12 +338,8 @@ class Experiment(object):
         """
         Displays the menu of valid experiment options that can be performed.
         """
-        # Print experiment options menu
-        print('\n------------------------- EXPERIMENT OPTIONS -------------------------')
-        for i in range(len(self.__options)):
-            # Print description of current option in options list
-            print('{indx: >4}. {desc}'.format(indx=i, desc=self.__options[i][1]))
-        print('----------------------------------------------------------------------')
+        # Print the prebuilt experiment options menu
+        sys.stdout.write(self.__menu)
         return
 
     def process_option(self, option):
@@ -282,9 +355,48 @@ class Experiment(object):
         quit : bool
             Whether or not to quit the experiment.
         """
-        print('OPTION {0}: {1}'.format(option, self.__options[option][1]))
-        return self.__options[option][0](self)
+        action, desc = self.__options[option]
+        print('OPTION {0}: {1}'.format(option, desc))
+        return action(self)
     
+    def __prompt_choice(self, prompt, choices=__YES_NO, error=_ERR_YES_NO):
+        """Prompts the user until they enter one of the valid choices.
+
+        Parameters
+        ----------
+        prompt : string
+            The message to prompt the user with.
+        choices : frozenset(string), optional
+            The valid (lowercase) responses to the prompt.
+        error : string, optional
+            The (newline terminated) error message to display when the response is invalid.
+
+        Returns
+        -------
+        choice : string
+            The valid (lowercase) response entered by the user.
+        """
+        choice = input(prompt).strip().lower()
+        while (choice not in choices):
+            sys.stdout.write(error)
+            choice = input(prompt).strip().lower()
+        return choice
+
+    def __prompt_yes_no(self, prompt):
+        """Prompts the user until they answer a yes or no question with either 'y' or 'n'.
+
+        Parameters
+        ----------
+        prompt : string
+            The question to prompt the user with.
+
+        Returns
+        -------
+        answer : bool
+            Whether or not the user answered yes.
+        """
+        return (self.__prompt_choice(prompt) == 'y')
+
     def __quit(self):
         """Prompts the user if they would like to end the experiment and quits the current experiment if
         they choose to do so.
@@ -296,45 +408,78 @@ class Experiment(object):
         """
         # Get confirmation to continue from user
         print('Warning - Unsaved data will be lost.')
-        confirmation = input('Would you like to proceed (y/n)?: ').lower()
-        while (confirmation != 'y' and confirmation != 'n'):
-            cprint("ERROR: invalid input: please enter either 'y' or 'n'", 'red')
-            confirmation = input('Would you like to proceed (y/n)?: ').lower()
+        confirmation = self.__prompt_yes_no('Would you like to proceed (y/n)?: ')
         # Quit experiment if user confirmed
-        return (True if (confirmation == 'y') else False)
+        return confirmation
+
+    def __append_entry(self, entry):
+        """Adds a light source entry to the end of the current experiment datalog.
+
+        Parameters
+        ----------
+        entry : Light_Source object
+            The light source entry to add to the datalog.
+        """
+        # Double the size of the wavelength and stopping voltage arrays if they are full
+        log_size = len(self.__datalog)
+        if (log_size == self.__wavelengths_nm.size):
+            self.__wavelengths_nm = np.resize(self.__wavelengths_nm, 2*log_size)
+            self.__voltages = np.resize(self.__voltages, 2*log_size)
+        # Add entry to datalog
+        self.__wavelengths_nm[log_size] = entry.get_wavelength()
+        self.__voltages[log_size] = entry.get_stopping_voltage()
+        self.__datalog.append(entry)
+        self.__results_dirty = True
+        return
+
+    def __pop_entry(self, indx):
+        """Removes a light source entry from the current experiment datalog.
+
+        Parameters
+        ----------
+        indx : int
+            The index of the entry to remove from the datalog.
+
+        Returns
+        -------
+        entry : Light_Source object
+            The light source entry that was removed from the datalog.
+        """
+        # Remove entry from datalog and shift the following wavelengths and stopping voltages down
+        entry = self.__datalog.pop(indx)
+        log_size = len(self.__datalog)
+        self.__wavelengths_nm[indx:log_size] = self.__wavelengths_nm[indx+1:log_size+1]
+        self.__voltages[indx:log_size] = self.__voltages[indx+1:log_size+1]
+        self.__results_dirty = True
+        return entry
 
     def __add_log_entry(self):
         """Prompts the user to collect or load data for a light source entry and adds it to the current
-        datalog for the experiment and displays teh data.
+        datalog for the experiment and optionally displays the data.
         """
         # Get source type from user
-        source_type = input('Is this an LED or a Laser?: ').upper()
-        while (source_type != 'LED' and source_type != 'LASER'):
-            cprint("ERROR: invalid input: please enter either 'LED' or 'Laser'", 'red')
-            source_type = input('Is this an LED or a Laser?: ').upper()
-        if (source_type != 'LED'): source_type = source_type.capitalize()
+        source_type = self.__prompt_choice('Is this an LED or a Laser?: ', self.__SOURCE_TYPES, _ERR_SOURCE_TYPE)
+        source_type = 'LED' if (source_type == 'led') else 'Laser'
         # Get source wavelength (in nanometers) from user
         wavelength_nm = 0
         while (wavelength_nm <= 0):
-            try:
-                wavelength_nm = float(input('Enter the {} wavelength in nm: '.format(source_type)))
-                if (wavelength_nm <= 0): cprint('ERROR: invalid input: wavelength must be a positive real number', 'red')
-            except:
-                cprint('ERROR: invalid input: wavelength must be a positive real number', 'red')
+            value = input('Enter the {} wavelength in nm: '.format(source_type))
+            # Check that wavelength is a positive, finite real number
+            if (_FLOAT_RE.match(value) and float(value) > 0 and math.isfinite(float(value))):
+                wavelength_nm = float(value)
+            else:
+                sys.stdout.write(_ERR_WAVELENGTH)
         # Create light source entry from based on entered user specifications
         entry = source.Light_Source(wavelength_nm, source_type)
         # Get load file response from user
-        from_file = input('Load data from csv file (y/n)?: ').lower()
-        while (from_file != 'y' and from_file != 'n'):
-            cprint("ERROR: invalid input: please enter either 'y' or 'n'", 'red')
-            from_file = input('Load data from csv file (y/n)?: ').lower()
+        from_file = self.__prompt_yes_no('Load data from csv file (y/n)?: ')
         # Load data from file if available, otherwise collect data manually
-        if (from_file == 'y'):
+        if (from_file):
             try:
                 # Load data from existing csv file
                 entry.load_data_from_csv(input('Enter csv file path: '))
             except:
-                cprint('ERROR: read_csv: unable to load file', 'red')
+                sys.stdout.write(_ERR_READ_CSV)
                 return
         else:
             # Collect data manually
@@ -342,9 +487,10 @@ class Experiment(object):
         # Add light source entry to datalog
         print('[+]Added entry:')
         print('->', entry)
-        self.__datalog += [entry]
-        # Plot the added light source data
-        entry.plot_data()
+        self.__append_entry(entry)
+        # Plot the added light source data if requested
+        if (self.__prompt_yes_no('Plot data now (y/n)?: ')):
+            entry.plot_data()
         return
 
     def __remove_log_entry(self):
@@ -352,7 +498,8 @@ class Experiment(object):
         from the datalog if it was a valid entry.
         """
         # Check that there is at least 1 entry in the datalog
-        if (len(self.__datalog) > 0):
+        log_size = len(self.__datalog)
+        if (log_size > 0):
             # Print curernt experiment datalog
             self.__display_log()
             print('Warning - This action cannot be undone')
@@ -360,16 +507,16 @@ class Experiment(object):
                 # Get entry to remove from experiment datalog
                 indx = int(input('Select the entry to remove: '))
                 # Remove selected entry if valid
-                if (indx >= 0 and indx < len(self.__datalog)):
+                if (0 <= indx < log_size):
                     # Remove entry from datalog
-                    entry = self.__datalog.pop(indx)
+                    entry = self.__pop_entry(indx)
                     # Print removed entry
                     print('[+]Removed entry:')
                     print('->', entry)
                 else:
-                    cprint('ERROR: invalid entry: no entries were removed', 'red')
+                    sys.stdout.write(_ERR_REMOVE)
             except:
-                cprint('ERROR: invalid entry: no entries were removed', 'red')
+                sys.stdout.write(_ERR_REMOVE)
         else:
             print('[+]The datalog is already empty')
         return
@@ -379,7 +526,8 @@ class Experiment(object):
         from the datalog if it was a valid entry.
         """
         # Check that there is at least 1 entry in the datalog
-        if (len(self.__datalog) > 0):
+        log_size = len(self.__datalog)
+        if (log_size > 0):
             # Print curernt experiment datalog
             self.__display_log()
             print('Warning - This operation will overwrite existing data')
@@ -387,24 +535,21 @@ class Experiment(object):
                 # Get entry to update from experiment datalog
                 indx = int(input('Select the entry to update: '))
                 # Update selected entry if valid
-                if (indx >= 0 and indx < len(self.__datalog)):
+                if (0 <= indx < log_size):
                     # Remove entry from datalog
-                    entry = self.__datalog.pop(indx)
+                    entry = self.__pop_entry(indx)
                     print('{i: >2}. '.format(i=indx), entry)
                     # Create new light source entry from based on selected entry to update
                     new_entry = source.Light_Source(entry.get_wavelength(), entry.get_type())
                     # Get load file response from user
-                    from_file = input('Load data from csv file (y/n)?: ').lower()
-                    while (from_file != 'y' and from_file != 'n'):
-                        cprint("ERROR: invalid input: please enter either 'y' or 'n'", 'red')
-                        from_file = input('Load data from csv file (y/n)?: ').lower()
+                    from_file = self.__prompt_yes_no('Load data from csv file (y/n)?: ')
                     # Load data from file if available, otherwise collect data manually
-                    if (from_file == 'y'):
+                    if (from_file):
                         try:
                             # Load data from existing csv file
                             new_entry.load_data_from_csv(input('Enter csv file path: '))
                         except:
-                            cprint('ERROR: read_csv: unable to load file', 'red')
+                            sys.stdout.write(_ERR_READ_CSV)
                             return
                     else:
                         # Collect data manually
@@ -412,13 +557,14 @@ class Experiment(object):
                     # Add updated light source entry to datalog
                     print('[+]Updated entry:')
                     print('->', new_entry)
-                    self.__datalog += [new_entry]
-                    # Plot the updated light source data
-                    new_entry.plot_data()
+                    self.__append_entry(new_entry)
+                    # Plot the updated light source data if requested
+                    if (self.__prompt_yes_no('Plot data now (y/n)?: ')):
+                        new_entry.plot_data()
                 else:
-                    cprint('ERROR: invalid entry: no entries were updated', 'red')
+                    sys.stdout.write(_ERR_UPDATE)
             except:
-                cprint('ERROR: invalid entry: no entries were updated', 'red')
+                sys.stdout.write(_ERR_UPDATE)
         else:
             print('[+]The datalog is currently empty')
         return
@@ -430,10 +576,9 @@ class Experiment(object):
         log_size = len(self.__datalog)
         if (log_size > 0):
             # Print curernt experiment datalog
-            print('--------------- Datalog for {name} ---------------'.format(name=self.__name))
-            for i in range(log_size):
-                # Print current entry in experiment datalog
-                print('{indx: >2}. '.format(indx=i), self.__datalog[i])
+            lines = ['--------------- Datalog for {name} ---------------\n'.format(name=self.__name)]
+            lines += ['{indx: >2}.  {entry}\n'.format(indx=i, entry=entry) for i, entry in enumerate(self.__datalog)]
+            sys.stdout.write(''.join(lines))
         else:
             print('[+]The datalog is currently empty')
         return
@@ -451,7 +596,7 @@ class Experiment(object):
                 # Get entry to view from experiment datalog
                 indx = int(input('Select the entry to view: '))
                 # View selected entry if valid
-                if (indx >= 0 and indx < log_size):
+                if (0 <= indx < log_size):
                     # Print the selected entry
                     entry = self.__datalog[indx]
                     print('{i: >2}. '.format(i=indx), entry, '\n')
@@ -460,9 +605,9 @@ class Experiment(object):
                     # Display data plot for the selected entry
                     entry.plot_data()
                 else:
-                    cprint('ERROR: invalid entry: unable to view entry', 'red')
+                    sys.stdout.write(_ERR_VIEW)
             except:
-                cprint('ERROR: invalid entry: unable to view entry', 'red')
+                sys.stdout.write(_ERR_VIEW)
         else:
             print('[+]The datalog is currently empty')
         return
@@ -474,24 +619,20 @@ class Experiment(object):
         if (log_size > 0):
             # Get confirmation to continue from user
             print('Warning - This action may overwrite existing save files')
-            confirmation = input('Would you like to proceed (y/n)?: ').lower()
-            while (confirmation != 'y' and confirmation != 'n'):
-                cprint("ERROR: invalid input: please enter either 'y' or 'n'", 'red')
-                confirmation = input('Would you like to proceed (y/n)?: ').lower()
+            confirmation = self.__prompt_yes_no('Would you like to proceed (y/n)?: ')
             # Save current datalog to file if user confirmed
-            if (confirmation == 'y'):
+            if (confirmation):
                 try:
                     # Get or create directory to save datalog to
                     out_dir = './' + self.__name
-                    if (not os.path.exists(out_dir)):
-                        os.mkdir(out_dir)
+                    os.makedirs(out_dir, exist_ok=True)
                     # Save data for each entry in datalog to csv files
-                    for i in range(log_size):
+                    for entry in self.__datalog:
                         # Save current entry in datalog to file
-                        self.__datalog[i].save_data(out_dir)
+                        entry.save_data(out_dir)
                     print('[+]The datalog has been saved')
                 except:
-                    cprint('ERROR: save_log: unable to save data to files', 'red')
+                    sys.stdout.write(_ERR_SAVE_LOG)
         else:
             print('[+]The datalog is currently empty')
         return
@@ -502,8 +643,8 @@ class Experiment(object):
         """
         # Check that there is at least 1 entry in the datalog
         if (len(self.__datalog) > 0):
-            # Create wavelength vs energy dataframe from each light source entry in datalog
-            self.__create_energy_df()
+            # Compute current experiment results if the datalog has changed
+            self.__update_results()
             # Plot current experiment results and regression line
             self.__plot_energy_data()
             # Print the current estimates and accuracy results for the experiment
@@ -520,29 +661,26 @@ class Experiment(object):
         if (len(self.__datalog) > 0):
             # Get confirmation to continue from user
             print('Warning - This action may overwrite existing save files')
-            confirmation = input('Would you like to proceed (y/n)?: ').lower()
-            while (confirmation != 'y' and confirmation != 'n'):
-                cprint("ERROR: invalid input: please enter either 'y' or 'n'", 'red')
-                confirmation = input('Would you like to proceed (y/n)?: ').lower()
+            confirmation = self.__prompt_yes_no('Would you like to proceed (y/n)?: ')
             # Save results to file if user confirmed
-            if (confirmation == 'y'):
+            if (confirmation):
                 try:
                     # Get or create directory to save results to
                     out_dir = './' + self.__name
-                    if (not os.path.exists(out_dir)):
-                        os.mkdir(out_dir)
-                    # Create wavelength vs energy dataframe from each light source entry in datalog
-                    self.__create_energy_df()
-                    # Create file to save wavelength vs energy dataframe to
+                    os.makedirs(out_dir, exist_ok=True)
+                    # Compute current experiment results if the datalog has changed
+                    self.__update_results()
+                    # Create file to save wavelength vs energy data to
                     path = out_dir + '/' + 'source_energies.csv'
-                    self.__energy_df.to_csv(path, encoding='utf-8', index=False)
+                    energy_data = np.column_stack((self.__lam, self.__nu, self.__Vs, self.__E))
+                    np.savetxt(path, energy_data, fmt='%s', delimiter=',', header='λ,ν,V_s,E', comments='', encoding='utf-8')
                     # Save plot of current experiment results and regression line to file
                     self.__plot_energy_data(save=True)
                     # Save current estimates and accuracy results for the experiment to file
                     self.__print_report(save=True)
                     print('[+]The results have been saved')
                 except:
-                    cprint('ERROR: save_results: unable to save results to file', 'red')
+                    sys.stdout.write(_ERR_SAVE_RESULTS)
         else:
             print('[+]The datalog is currently empty')
         return
@@ -554,26 +692,29 @@ class Experiment(object):
         if (len(self.__datalog) > 0):
             # Get confirmation to continue from user
             print('Warning - This action cannot be undone')
-            confirmation = input('Would you like to proceed (y/n)?: ').lower()
-            while (confirmation != 'y' and confirmation != 'n'):
-                cprint("ERROR: invalid input: please enter either 'y' or 'n'", 'red')
-                confirmation = input('Would you like to proceed (y/n)?: ').lower()
+            confirmation = self.__prompt_yes_no('Would you like to proceed (y/n)?: ')
             # Clear datalog entries if user confirmed
-            if (confirmation == 'y'):
+            if (confirmation):
                 self.__datalog.clear()
+                self.__results_dirty = True
                 print('[+]The datalog has been cleared')
         else:
             print('[+]The datalog is already empty')
         return
 
-    # Mapping of valid experiment options and their descriptions
-    __options = {0: (__quit, 'Quit experiment'),
-                 1: (__add_log_entry, 'Add entry to datalog'),
-                 2: (__remove_log_entry, 'Remove entry from datalog'),
-                 3: (__update_log_entry, 'Update datalog entry'),
-                 4: (__display_log, 'Display current datalog'),
-                 5: (__view_log_entry, 'View datalog entry'),
-                 6: (__save_log, 'Save datalog entries to files'),
-                 7: (__display_results, 'Display estimate results'),
-                 8: (__save_results, 'Save results'),
-                 9: (__clear_log, 'Clear datalog')}
+    # Sequence of valid experiment options and their descriptions (indexed by option number)
+    __options = ((__quit, 'Quit experiment'),
+                 (__add_log_entry, 'Add entry to datalog'),
+                 (__remove_log_entry, 'Remove entry from datalog'),
+                 (__update_log_entry, 'Update datalog entry'),
+                 (__display_log, 'Display current datalog'),
+                 (__view_log_entry, 'View datalog entry'),
+                 (__save_log, 'Save datalog entries to files'),
+                 (__display_results, 'Display estimate results'),
+                 (__save_results, 'Save results'),
+                 (__clear_log, 'Clear datalog'))
+
+    # Experiment options menu text, built once from the options sequence
+    __menu = ('\n------------------------- EXPERIMENT OPTIONS -------------------------\n'
+              + ''.join('{indx: >4}. {desc}\n'.format(indx=i, desc=desc) for i, (_, desc) in enumerate(__options))
+              + '----------------------------------------------------------------------\n')
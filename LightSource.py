@@ -12,9 +12,12 @@ pertaining to the light source (collect_data, plot_data, get_stopping_voltage, e
 ## Imports
 ######################################################################
 
+import os
+import bisect
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from termcolor import cprint
 import piplates.DAQC2plate as DAQC2
 
@@ -32,6 +35,43 @@ __maintainer__ = "Conner Graham"
 __email__ = "connergraham888@gmail.com"
 __status__ = "Development"
 
+######################################################################
+# Module Constants
+######################################################################
+
+# Visible spectrum color bands: the upper (exclusive) band edges in nanometers, and the plot color
+# and upper data collection voltage bound (in volts) for the purple, blue, green, yellow, orange, and
+# red bands. The visible spectrum spans 400-700 nm inclusive.
+_BAND_EDGES = (450, 500, 570, 590, 610)
+_BAND_COLORS = ('darkviolet', 'blue', 'forestgreen', 'gold', 'darkorange', 'red')
+_BAND_MAX_VOLTAGES = (1.8, 1.5, 1.2, 1.0, 0.8, 0.7)
+
+# Random number generator used to randomize the order of retarding voltage samples
+_RNG = np.random.default_rng()
+
+######################################################################
+# Module Functions
+######################################################################
+
+def _first_nonnegative(values):
+    """Finds the index of the first nonnegative value in an array.
+
+    The photocurrent is only monotone in retarding voltage up to measurement noise, so a binary
+    search (np.searchsorted) can skip past the true crossing. A linear scan is used instead.
+
+    Parameters
+    ----------
+    values : ndarray
+        The 1-D array of values to search.
+
+    Returns
+    -------
+    index : int
+        The index of the first nonnegative value, or -1 if there are none.
+    """
+    nonnegative = (values >= 0)
+    return (int(nonnegative.argmax()) if nonnegative.any() else -1)
+
 ######################################################################
 # Light_Source Class Definition
 ######################################################################
@@ -41,6 +81,14 @@ class Light_Source(object):
     effect experiment.
     """
 
+    # Fixed set of instance attributes (avoids a per-instance attribute dictionary)
+    __slots__ = ('__wavelength', '__source_type', '__source_df', '__retarding_voltage', '__photocurrent',
+                 '__stop_voltage')
+
+    # Off-screen figure (and its axes) shared by all light sources for saving graphs, created on first save
+    __save_fig = None
+    __save_ax = None
+
     def __init__(self, wavelength_nm, s_type="LED"):
         """Constructor for the Light_Source class.
 
@@ -54,6 +102,8 @@ class Light_Source(object):
         self.__wavelength = wavelength_nm
         self.__source_type = s_type
         self.__source_df = None
+        self.__retarding_voltage = None         # retarding voltage column of the source dataframe
+        self.__photocurrent = None              # effective photocurrent column of the source dataframe
         self.__stop_voltage = 0
         return
     
@@ -107,6 +157,18 @@ class Light_Source(object):
         """
         return self.__stop_voltage
 
+    def __get_band(self):
+        """Gets the visible spectrum color band that the light source falls in.
+
+        Returns
+        -------
+        band : int
+            The index of the color band of the light source, or -1 if it is outside the visible spectrum.
+        """
+        if (self.__wavelength < 400 or self.__wavelength > 700):
+            return -1
+        return bisect.bisect_right(_BAND_EDGES, self.__wavelength)
+
     def __get_color(self):
         """Gets the plot color for the light source.
 
@@ -115,21 +177,8 @@ class Light_Source(object):
         color : string
             The color (used for plotting) of the light source.
         """
-        # Determine which color range the wavelength falls in
-        if (self.__wavelength >= 400 and self.__wavelength < 450):          # color = purple
-            return 'darkviolet'
-        elif (self.__wavelength >= 450 and self.__wavelength < 500):        # color = blue
-            return 'blue'
-        elif (self.__wavelength >= 500 and self.__wavelength < 570):        # color = green
-            return 'forestgreen'
-        elif (self.__wavelength >= 570 and self.__wavelength < 590):        # color = yellow
-            return 'gold'
-        elif (self.__wavelength >= 590 and self.__wavelength < 610):        # color = orange
-            return 'darkorange'
-        elif (self.__wavelength >= 610 and self.__wavelength <= 700):       # color = reed
-            return 'red'
-        else:                                                               # color outside visible spectrum
-            return 'black'
+        band = self.__get_band()
+        return ('black' if (band < 0) else _BAND_COLORS[band])
 
     def __get_max_voltage(self):
         """Gets the upper voltage bound for collecting for the light source.
@@ -139,38 +188,17 @@ class Light_Source(object):
         max_voltage : float
             The upper voltage bound (in volts) for collecting data for the light source.
         """
-        λ = self.__wavelength
-        # Determine which color range the wavelength falls in
-        if (λ >= 400 and λ < 450):              # color = purple
-            return 1.8
-        elif (λ >= 450 and λ < 500):            # color = blue
-            return 1.5
-        elif (λ >= 500 and λ < 570):            # color = green
-            return 1.2
-        elif (λ >= 570 and λ < 590):            # color = yellow
-            return 1.0
-        elif (λ >= 590 and λ < 610):            # color = orange
-            return 0.8
-        elif (λ >= 610 and λ <= 700):           # color = red
-            return 0.7
-        else:                                   # color outside visible spectrum
-            return 2
+        band = self.__get_band()
+        return (2 if (band < 0) else _BAND_MAX_VOLTAGES[band])
 
     def __calc_stop_volage(self):
         """Calculates the stopping voltage for the light source based on the retarding voltage vs photocurrent
         data. Stopping voltage is estimated to be the voltage where teh photocurrent first dropps to zero.
         """
-        # Extract retarding voltage and photocurrent data from dataframe
-        retarding_voltage = np.array(self.__source_df['V_r'], dtype='float').reshape(-1,1)
-        photocurrent = np.array(self.__source_df['I_φ'], dtype='float').reshape(-1,1)
-        # Find first occurance of photocurrent dropping to zero
-        index = -1
-        for i in range(photocurrent.size):
-            if (photocurrent[i] >= 0):
-                index = i
-                break
+        # Find first occurance of photocurrent dropping to zero (or the last sample if it never does)
+        index = _first_nonnegative(self.__photocurrent)
         # Set stopping voltage to voltage where photocurrent first dropped to zero
-        self.__stop_voltage = retarding_voltage[index][0]
+        self.__stop_voltage = float(self.__retarding_voltage[index])
         return
 
     def __create_source_df(self, source_data):
@@ -181,45 +209,70 @@ class Light_Source(object):
         source_data : ndarray
             The collected photocurent data for the light source.
         """
-        # Create empty dataframe with columns for retarding volatge, the photocurrent when the light
-        # source is unblocked and blocked, and the effective photocurrent.
-        source_df = pd.DataFrame([], columns=['V_r', 'I_ub', 'I_b', 'I_φ'])
-        # Load collected data into dataframe
-        source_df['V_r'] = source_data[:,0]
-        source_df['I_ub'] = source_data[:,1]
-        source_df['I_b'] = source_data[:,2]
-        source_df['I_φ'] = source_data[:,1] + source_data[:,2]
-        # Sort dataframe by ordering based on increasing retarding voltage
-        self.__source_df = source_df.sort_values(by=['V_r'])
+        # Order collected data based on increasing retarding voltage
+        order = np.argsort(source_data[:,0], kind='stable')
+        retarding_voltage = source_data[order,0]
+        unblocked_current = source_data[order,1]
+        blocked_current = source_data[order,2]
+        photocurrent = unblocked_current + blocked_current
+        # Create dataframe with columns for retarding volatge, the photocurrent when the light source
+        # is unblocked and blocked, and the effective photocurrent.
+        self.__source_df = pd.DataFrame({'V_r': retarding_voltage,
+                                         'I_ub': unblocked_current,
+                                         'I_b': blocked_current,
+                                         'I_φ': photocurrent})
+        # Keep the retarding voltage and photocurrent arrays for calculations and plotting
+        self.__retarding_voltage = retarding_voltage
+        self.__photocurrent = photocurrent
         return
 
-    def collect_data(self):
+    def __measure_photocurrent(self, V_r):
+        """Measures the photocurrent for the light source at a single retarding voltage.
+
+        Parameters
+        ----------
+        V_r : float
+            The retarding voltage (in volts) to supply to the photodiode.
+
+        Returns
+        -------
+        V_p : float
+            The measured photocurrent for the light source.
+        """
+        # Set retarding voltage to supply to photodiode
+        DAQC2.setDAC(0,0,V_r)
+        # Measure resulting photocurrent
+        return (DAQC2.getADC(0,0) - DAQC2.getADC(0,1))
+
+    def collect_data(self, seed=None):
         """Collect retarding voltage vs photocurrent data for the light source into a dataframe and determine
         the stopping voltage for the light source.
+
+        Parameters
+        ----------
+        seed : int, optional
+            The seed used to randomize the sample order, for a reproducible sweep.
         """
         # Get retarging voltages to take samples over and randomize sample to avoid error in collection
         voltages = np.linspace(0, self.__get_max_voltage(), num=1500)
-        np.random.shuffle(voltages)
+        rng = _RNG if (seed is None) else np.random.default_rng(seed)
+        rng.shuffle(voltages)
         # Get dark current value (photocurrent when blocked) from user
         dark_current = 0
         while (True):
             try:
                 dark_current = float(input('Enter the dark current value in V: '))
                 break
-            except:
+            except ValueError:
                 cprint('ERROR: invalid input: dark current must be a real number', 'red')
+        # Fill in the retarding voltage and dark current columns up front
+        source_data = np.empty((voltages.size,3))
+        source_data[:,0] = voltages
+        source_data[:,2] = dark_current
         # Collect photocurrent data over all retarding volatge samples
-        source_data = np.zeros((voltages.size,3))
         input("Press ENTER to begin data collection...")
-        for i in range(voltages.size):
-            V_r = voltages[i]
-            source_data[i,0] = V_r
-            # Set retarding voltage to supply to photodiode
-            DAQC2.setDAC(0,0,V_r)
-            # Measure resulting photocurrent
-            V_p = DAQC2.getADC(0,0) - DAQC2.getADC(0,1)
-            source_data[i,1] = V_p
-            source_data[i,2] = dark_current
+        source_data[:,1] = np.fromiter((self.__measure_photocurrent(V_r) for V_r in voltages),
+                                       dtype=np.float64, count=voltages.size)
         # Store data in dataframe
         self.__create_source_df(source_data)
         # Estimate stopping voltage for light source
@@ -235,64 +288,75 @@ class Light_Source(object):
         filename : string
             The name of the file from which to load data.
         """
-        # Load data from csv file into dataframe
-        self.__source_df = pd.read_csv(filename)
+        # Load data from csv file into dataframe (all columns are real valued, so skip type inference)
+        self.__source_df = pd.read_csv(filename, engine='c', dtype=np.float64)
+        # Keep the retarding voltage and photocurrent arrays for calculations and plotting
+        self.__retarding_voltage = self.__source_df['V_r'].to_numpy(dtype=np.float64, copy=False)
+        self.__photocurrent = self.__source_df['I_φ'].to_numpy(dtype=np.float64, copy=False)
         # Estimate stopping voltage for light source
         self.__calc_stop_volage()
         return
 
-    def plot_data(self):
-        """Graph the collected light source data and calculated stopping voltage."""
-        # Extract retarding voltage and photocurrent data from dataframe
-        retarding_voltage = np.array(self.__source_df['V_r'], dtype='float').reshape(-1,1)
-        photocurrent = np.array(self.__source_df['I_φ'], dtype='float').reshape(-1,1)
+    def __build_figure(self, save=False):
+        """Builds the graph of the collected light source data and calculated stopping voltage.
+
+        Parameters
+        ----------
+        save : bool, optional
+            Whether or not the graph is being built to be saved to a file.
+
+        Returns
+        -------
+        fig : Figure object
+            The figure containing the light source graph.
+        """
+        # Get figure to plot to, reusing the off-screen figure if the graph is being saved
+        if (save):
+            if (Light_Source.__save_fig is None):
+                Light_Source.__save_fig = Figure()
+                Light_Source.__save_ax = Light_Source.__save_fig.add_subplot()
+            fig, ax = Light_Source.__save_fig, Light_Source.__save_ax
+            ax.cla()
+        else:
+            fig, ax = plt.subplots()
         # Plot retarding voltage vs photocurrent data
-        plt.scatter(retarding_voltage, photocurrent, color='black')
+        ax.plot(self.__retarding_voltage, self.__photocurrent, linestyle='none', marker='o', color='black')
         # Plot vertical line for stopping voltage
         label = 'V_s = {:.4f}'.format(self.__stop_voltage)
-        plt.axvline(x=self.__stop_voltage, color=self.__get_color(), label=label)
+        ax.axvline(x=self.__stop_voltage, color=self.__get_color(), label=label)
         # Add labels and other details to graph
-        plt.title('{0:.2f}nm {1:} Stopping Voltage'.format(self.__wavelength, self.__source_type), fontsize=18)
-        plt.xlabel('Retarding Voltage (V)', fontsize=14)
-        plt.ylabel('Photocurrent (µA)', fontsize=14)
-        plt.gca().invert_yaxis()
-        plt.grid()
-        plt.legend(loc='lower left')
-        # Show the plot
+        ax.set_title('{0:.2f}nm {1:} Stopping Voltage'.format(self.__wavelength, self.__source_type), fontsize=18)
+        ax.set_xlabel('Retarding Voltage (V)', fontsize=14)
+        ax.set_ylabel('Photocurrent (µA)', fontsize=14)
+        ax.invert_yaxis()
+        ax.grid()
+        ax.legend(loc='lower left')
+        return fig
+
+    def plot_data(self):
+        """Graph the collected light source data and calculated stopping voltage."""
+        # Build and show the plot, releasing only its figure once the window is closed
+        fig = self.__build_figure()
         plt.show()
+        plt.close(fig)
         return
 
-    def save_data(self, out_dir='.'):
+    def save_data(self, out_dir='.', dpi=120):
         """Save the collected light source data and calculated stopping voltage to files.
 
         Parameters
         ----------
         out_dir : string, optional
             The name of the directory to save the data to.
+        dpi : float, optional
+            The resolution (in dots per inch) of the saved graph.
         """
         # Get path for file to save light source dataframe to
-        path = out_dir + '/' + self.__source_type.lower() + '_' + str(round(self.__wavelength)) + 'nm.csv'
-        self.__source_df.to_csv(path, encoding='utf-8', index=False)
+        path = os.path.join(out_dir, self.__source_type.lower() + '_' + str(round(self.__wavelength)) + 'nm.csv')
+        self.__source_df.to_csv(path, encoding='utf-8', index=False, lineterminator='\n')
         # Get path for file to save light source graph to
-        path = path.replace('.csv', '.jpg')
-        # Extract retarding voltage and photocurrent data from dataframe
-        retarding_voltage = np.array(self.__source_df['V_r'], dtype='float').reshape(-1,1)
-        photocurrent = np.array(self.__source_df['I_φ'], dtype='float').reshape(-1,1)
-        # Create figure to save plot to
-        fig = plt.figure()
-        # Plot retarding voltage vs photocurrent data
-        plt.scatter(retarding_voltage, photocurrent, color='black')
-        # Plot vertical line for stopping voltage
-        label = 'V_s = {:.4f}'.format(self.__stop_voltage)
-        plt.axvline(x=self.__stop_voltage, color=self.__get_color(), label=label) 
-        # Add labels and other details to graph
-        plt.title('{0:.2f}nm {1:} Stopping Voltage'.format(self.__wavelength, self.__source_type), fontsize=18)
-        plt.xlabel('Retarding Voltage (V)', fontsize=14)
-        plt.ylabel('Photocurrent (µA)', fontsize=14)
-        plt.gca().invert_yaxis()
-        plt.grid()
-        plt.legend(loc='lower left')
-        # Save and close the plot
-        fig.savefig(path, bbox_inches='tight', dpi=250)
-        plt.close('all')
+        path = os.path.splitext(path)[0] + '.jpg'
+        # Build and save the plot
+        fig = self.__build_figure(save=True)
+        fig.savefig(path, bbox_inches='tight', dpi=dpi)
         return
@@ -39,10 +39,10 @@ __status__ = "Development"
 
 def print_welcome_banner():
     """Prints the program welcome banner and instructions."""
-    print('Welcome! Perform your own Photoelectric Effect experiment.')
-    print('You will be asked to provide information about various light sources.')
-    print("From this information, you will be able to approximate Plank's constant.")
-    print("Select the 'Quit' option for the experiment when you are done.\n")
+    sys.stdout.write('Welcome! Perform your own Photoelectric Effect experiment.\n'
+                     'You will be asked to provide information about various light sources.\n'
+                     "From this information, you will be able to approximate Plank's constant.\n"
+                     "Select the 'Quit' option for the experiment when you are done.\n\n")
     return
 
 def get_option(min=0, max=sys.maxsize):
@@ -69,7 +69,7 @@ def get_option(min=0, max=sys.maxsize):
             # Check that option is in valid range
             if (option < min or option > max):
                 cprint('ERROR: invalid option: valid options are ' + str(min) + '-' + str(max), 'red')
-        except:
+        except ValueError:
             cprint('ERROR: invalid input: option must be a valid integer', 'red')
     print()
     return option